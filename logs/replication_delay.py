@@ -1,10 +1,10 @@
-from utils.db_connection import get_connection
+from utils.db_connection import connection_scope
 
-def get_replication_delay():
+def get_replication_delay(conn=None):
     query = """
     SELECT client_addr, state, write_lag, flush_lag, replay_lag
     FROM pg_stat_replication;
     """
-    with get_connection() as conn, conn.cursor() as cur:
+    with connection_scope(conn) as conn, conn.cursor() as cur:
         cur.execute(query)
         return cur.fetchall()
@@ -1,30 +1,51 @@
-from utils.db_connection import get_connection
+from utils.db_connection import connection_scope
+from utils.formatting import format_ms
 
-def get_long_queries(threshold_ms=600, limit=10):
+def get_long_queries(threshold_ms=600, limit=10, conn=None):
     """
     Get queries exceeding a threshold (ms) with full query text and proper time formatting.
+
+    Ranking runs against pg_stat_statements(false), which skips query-text
+    materialization for every tracked statement; the text is then fetched
+    only for the rows that survive the threshold and LIMIT.
     """
-    query = f"""
-    SELECT 
-        query,
+    stats_query = """
+    SELECT
+        queryid,
         total_exec_time,
         mean_exec_time,
-        calls,
-        CASE 
-            WHEN total_exec_time >= 60000 THEN ROUND((total_exec_time/60000)::numeric, 2) || 'm'
-            WHEN total_exec_time >= 1000 THEN ROUND((total_exec_time/1000)::numeric, 2) || 's'
-            ELSE ROUND(total_exec_time::numeric, 2) || 'ms'
-        END as total_time_formatted,
-        CASE 
-            WHEN mean_exec_time >= 60000 THEN ROUND((mean_exec_time/60000)::numeric, 2) || 'm'
-            WHEN mean_exec_time >= 1000 THEN ROUND((mean_exec_time/1000)::numeric, 2) || 's'
-            ELSE ROUND(mean_exec_time::numeric, 2) || 'ms'
-        END as mean_time_formatted
-    FROM pg_stat_statements
-    WHERE mean_exec_time > {threshold_ms}
+        calls
+    FROM pg_stat_statements(false)
+    WHERE mean_exec_time > %s
     ORDER BY mean_exec_time DESC
-    LIMIT {limit};
+    LIMIT %s;
+    """
+    text_query = """
+    SELECT queryid, query
+    FROM pg_stat_statements(true)
+    WHERE queryid = ANY(%s);
     """
-    with get_connection() as conn, conn.cursor() as cur:
-        cur.execute(query)
-        return cur.fetchall()
+    # Plain client-side cursor on purpose: the result is bounded by LIMIT,
+    # so a named server-side cursor or dict rows would only add overhead.
+    with connection_scope(conn) as conn, conn.cursor() as cur:
+        cur.execute(stats_query, (threshold_ms, limit))
+        stats = cur.fetchall()
+        if not stats:
+            return []
+
+        cur.execute(text_query, ([row[0] for row in stats],))
+        query_texts = dict(cur.fetchall())
+
+        # Format times in Python instead of per-row CASE/ROUND/|| in SQL;
+        # the appended columns keep the row shape the PDF generator expects.
+        return [
+            (
+                query_texts.get(queryid, '<unknown>'),
+                total_exec_time,
+                mean_exec_time,
+                calls,
+                format_ms(total_exec_time),
+                format_ms(mean_exec_time),
+            )
+            for queryid, total_exec_time, mean_exec_time, calls in stats
+        ]
@@ -1,73 +1,76 @@
-from utils.db_connection import get_connection
+import heapq
 
-def get_cache_hit_ratio():
-    """Get comprehensive cache hit ratios including total, per-table, and index vs heap ratios"""
-    cache_data = {}
-    
-    # Get total cache hit ratio
-    cache_data['total'] = get_total_cache_hit_ratio()
-    
-    # Get per-table cache hit ratios
-    cache_data['per_table'] = get_per_table_cache_hit_ratio()
-    
-    # Get index vs heap ratio
-    cache_data['index_heap_ratio'] = get_index_heap_ratio()
-    
-    return cache_data
+import psycopg2.errors
 
-def get_total_cache_hit_ratio():
+from utils.db_connection import connection_scope
+
+def get_cache_hit_ratio(conn=None):
+    """Get comprehensive cache hit ratios including total, per-table, and index vs heap ratios.
+
+    All sub-queries run on one shared connection/cursor so a report pays a
+    single connection acquisition instead of three. Rows stay plain tuples:
+    every result here is LIMIT-bounded, so dict rows or server-side cursors
+    would cost more than they save.
+    """
+    with connection_scope(conn) as conn, conn.cursor() as cur:
+        cache_data = {'total': get_total_cache_hit_ratio(cur)}
+        cache_data.update(get_per_table_cache_stats(cur))
+        return cache_data
+
+def get_total_cache_hit_ratio(cur):
     """Get overall cache hit ratio"""
     query = """
-    SELECT 
-        sum(blks_hit) AS hits, 
+    SELECT
+        sum(blks_hit) AS hits,
         sum(blks_read) AS reads,
         (sum(blks_hit) / nullif(sum(blks_hit) + sum(blks_read), 0)) as ratio
     FROM pg_stat_database;
     """
-    with get_connection() as conn, conn.cursor() as cur:
-        cur.execute(query)
-        return cur.fetchone()
+    cur.execute(query)
+    return cur.fetchone()
+
+def get_per_table_cache_stats(cur):
+    """Get per-table cache hit ratios and index vs heap ratios from one scan.
+
+    pg_statio_user_tables is a view over pg_stat_get_* calls, so scanning it
+    once and deriving both ratio views in Python halves the catalog cost.
+    heapq keeps the top-K selection at O(N log K) instead of a full sort.
 
-def get_per_table_cache_hit_ratio():
-    """Get cache hit ratio per table"""
+    On large catalogs the live view itself is the dominant cost. If the DBA
+    maintains a periodically refreshed snapshot table (e.g.
+    CREATE UNLOGGED TABLE cache_hit_snapshot AS SELECT * FROM
+    pg_statio_user_tables, refreshed by cron), it is read instead.
+    """
     query = """
-    SELECT 
+    SELECT
         schemaname,
         relname as tablename,
         heap_blks_hit,
         heap_blks_read,
-        CASE 
-            WHEN (heap_blks_hit + heap_blks_read) > 0 
-            THEN ROUND((heap_blks_hit::numeric / (heap_blks_hit + heap_blks_read)) * 100, 2)
-            ELSE 0 
-        END as hit_ratio_percent
-    FROM pg_statio_user_tables
-    WHERE (heap_blks_hit + heap_blks_read) > 0
-    ORDER BY hit_ratio_percent ASC
-    LIMIT 20;
+        idx_blks_hit,
+        idx_blks_read
+    FROM {source}
+    WHERE (heap_blks_hit + heap_blks_read) > 0;
     """
-    with get_connection() as conn, conn.cursor() as cur:
-        cur.execute(query)
-        return cur.fetchall()
+    try:
+        cur.execute(query.format(source="cache_hit_snapshot"))
+    except psycopg2.errors.UndefinedTable:
+        # No snapshot maintained on this server; fall back to the live view.
+        cur.connection.rollback()
+        cur.execute(query.format(source="pg_statio_user_tables"))
 
-def get_index_heap_ratio():
-    """Get index vs heap usage ratio"""
-    query = """
-    SELECT 
-        schemaname,
-        relname as tablename,
-        heap_blks_hit + heap_blks_read as heap_blocks,
-        idx_blks_hit + idx_blks_read as index_blocks,
-        CASE 
-            WHEN (heap_blks_hit + heap_blks_read + idx_blks_hit + idx_blks_read) > 0 
-            THEN ROUND(((idx_blks_hit + idx_blks_read)::numeric / (heap_blks_hit + heap_blks_read + idx_blks_hit + idx_blks_read)) * 100, 2)
-            ELSE 0 
-        END as index_heap_ratio_percent
-    FROM pg_statio_user_tables
-    WHERE (heap_blks_hit + heap_blks_read) > 0
-    ORDER BY index_heap_ratio_percent DESC
-    LIMIT 20;
-    """
-    with get_connection() as conn, conn.cursor() as cur:
-        cur.execute(query)
-        return cur.fetchall()
+    per_table = []
+    index_heap = []
+    for schema, table, heap_hit, heap_read, idx_hit, idx_read in cur.fetchall():
+        heap_blocks = heap_hit + heap_read
+        index_blocks = (idx_hit or 0) + (idx_read or 0)
+        total_blocks = heap_blocks + index_blocks
+        hit_ratio = round(heap_hit / heap_blocks * 100, 2)
+        index_heap_ratio = round(index_blocks / total_blocks * 100, 2) if total_blocks else 0
+        per_table.append((schema, table, heap_hit, heap_read, hit_ratio))
+        index_heap.append((schema, table, heap_blocks, index_blocks, index_heap_ratio))
+
+    return {
+        'per_table': heapq.nsmallest(20, per_table, key=lambda row: row[4]),
+        'index_heap_ratio': heapq.nlargest(20, index_heap, key=lambda row: row[4]),
+    }
@@ -1,94 +1,163 @@
+from functools import lru_cache
 from pathlib import Path
-import re
-import psutil
-import yaml
 from utils.db_connection import get_connection
-import  paramiko
+from utils.caching import ttl_cache
+
+# paramiko (which drags in cryptography) and psutil are imported lazily in
+# the branch that needs them: localhost runs never touch SSH, remote runs
+# never touch psutil.
+
+# Whether psutil's CPU counter has a previous sample to diff against.
+_CPU_PRIMED = False
+
+@lru_cache(maxsize=1)
+def _load_db_config():
+    """Load and cache the database section of db_config.yaml (parsed once per process)."""
+    import yaml
+
+    config_file = Path(__file__).parent.parent / "config" / "db_config.yaml"
+    with open(config_file, "r") as f:
+        return yaml.safe_load(f)["database"]
 
 def get_cpu_ram_usage():
     """Get both system and PostgreSQL server metrics"""
-    
+    global _CPU_PRIMED
+
     # Check if we're connecting to localhost
     if _is_localhost_connection():
-        # Use local psutil for localhost connections
+        import psutil
+
+        # Use local psutil for localhost connections. The first call has no
+        # prior sample to diff against, so it pays one short interval; later
+        # calls are non-blocking.
+        if _CPU_PRIMED:
+            cpu_percent = psutil.cpu_percent(interval=None)
+        else:
+            cpu_percent = psutil.cpu_percent(interval=0.1)
+            _CPU_PRIMED = True
+        # One virtual_memory() snapshot instead of four /proc/meminfo reads
+        vm = psutil.virtual_memory()
         system_metrics = {
-            "system_cpu_percent": psutil.cpu_percent(interval=1),
-            "system_ram_percent": psutil.virtual_memory().percent,
-            "system_ram_total_gb": round(psutil.virtual_memory().total / (1024**3), 2),
-            "system_ram_used_gb": round(psutil.virtual_memory().used / (1024**3), 2),
-            "system_ram_available_gb": round(psutil.virtual_memory().available / (1024**3), 2)
+            "system_cpu_percent": cpu_percent,
+            "system_ram_percent": vm.percent,
+            "system_ram_total_gb": round(vm.total / (1024**3), 2),
+            "system_ram_used_gb": round(vm.used / (1024**3), 2),
+            "system_ram_available_gb": round(vm.available / (1024**3), 2)
         }
     else:
         # Get system metrics from remote PostgreSQL server
         system_metrics = _get_remote_system_metrics()
     
-    # Get PostgreSQL server metrics
-    postgres_metrics = get_postgres_server_metrics()
-    
-    return {**system_metrics, **postgres_metrics}
+    # Get PostgreSQL server metrics; key sets are disjoint, so update the
+    # existing dict instead of rebuilding a merged one.
+    system_metrics.update(get_postgres_server_metrics())
+
+    return system_metrics
 
 def _is_localhost_connection():
     """Check if the database connection is to localhost"""
-    config_file = Path(__file__).parent.parent / "config" / "db_config.yaml"
-    with open(config_file, "r") as f:
-        db= yaml.safe_load(f)["database"]
-        localhost_hosts = ['localhost', '127.0.0.1', '0.0.0.1', '::1']
+    db = _load_db_config()
+    localhost_hosts = ['localhost', '127.0.0.1', '0.0.0.1', '::1']
 
-        return db['host'] in localhost_hosts
-    
+    return db['host'] in localhost_hosts
+
+
+# Cached SSH client so repeated metric polls skip the TCP+KEX+auth handshake.
+_SSH_CLIENT = None
+
+def _get_ssh():
+    """Return a connected SSHClient, reusing the cached one when still alive."""
+    import paramiko
+
+    global _SSH_CLIENT
+    if _SSH_CLIENT is not None:
+        transport = _SSH_CLIENT.get_transport()
+        if transport is not None and transport.is_active():
+            return _SSH_CLIENT
+        # close() is safe on a dead transport and reaps the socket and
+        # keepalive thread a half-dead client may still own.
+        _SSH_CLIENT.close()
+        _SSH_CLIENT = None
+
+    db = _load_db_config()
+    ssh_host = db["host"]
+    ssh_user = db.get("ssh_user", "postgres")   # default user, can override in config
+    ssh_pass = db.get("ssh_password")           # or use key
+    ssh_key  = db.get("ssh_key")                # optional private key path
+    ssh_port = db.get("ssh_port")
+
+    ssh = paramiko.SSHClient()
+    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    if ssh_key:
+        ssh.connect(ssh_host, username=ssh_user, key_filename=ssh_key, timeout=5, port=ssh_port)
+    else:
+        ssh.connect(ssh_host, username=ssh_user, password=ssh_pass, timeout=5, port=ssh_port)
+    ssh.get_transport().set_keepalive(30)
+    _SSH_CLIENT = ssh
+    return ssh
 
+def _cpu_percent_from_proc_stat(cpu_part):
+    """Compute CPU% from two 'cpu ' lines of /proc/stat sampled a moment apart."""
+    samples = []
+    for line in cpu_part.splitlines():
+        if line.startswith("cpu "):
+            # user nice system idle iowait irq softirq steal; the guest
+            # fields after these are already counted inside user/nice.
+            samples.append([int(v) for v in line.split()[1:9]])
+    if len(samples) < 2:
+        return 0.0
+    first, second = samples[0], samples[1]
+    total_delta = sum(second) - sum(first)
+    # Fields 4 and 5 are idle and iowait
+    idle_delta = (second[3] + second[4]) - (first[3] + first[4])
+    if total_delta <= 0:
+        return 0.0
+    return round((1 - idle_delta / total_delta) * 100, 2)
 
 def _get_remote_system_metrics():
     """Get system metrics from the remote PostgreSQL server via SSH (Linux commands)"""
+    global _SSH_CLIENT
     try:
-        # Load DB config to get SSH connection details
-        config_file = Path(__file__).parent.parent / "config" / "db_config.yaml"
-        with open(config_file, "r") as f:
-            db = yaml.safe_load(f)["database"]
-
-        ssh_host = db["host"]
-        ssh_user = db.get("ssh_user", "postgres")   # default user, can override in config
-        ssh_pass = db.get("ssh_password")           # or use key
-        ssh_key  = db.get("ssh_key")                # optional private key path
-        ssh_port = db.get("ssh_port")
-        # Setup SSH client
-        ssh = paramiko.SSHClient()
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
-        if ssh_key:
-            ssh.connect(ssh_host, username=ssh_user, key_filename=ssh_key, timeout=5,port=ssh_port)
-        else:
-            ssh.connect(ssh_host, username=ssh_user, password=ssh_pass, timeout=5,port=ssh_port)
-
-        # Run commands to get CPU and memory info
-        # CPU usage (instant snapshot)
-        stdin, stdout, stderr = ssh.exec_command("top -bn1 | grep 'Cpu(s)'")
-        cpu_line = stdout.read().decode()
-        cpu_match = re.search(r"(\d+\.\d+)\s*id", cpu_line)
-        if cpu_match:
-            idle = float(cpu_match.group(1))
-            cpu_percent = round(100 - idle, 2)
-        else:
-            cpu_percent = 0.0
+        ssh = _get_ssh()
 
-        # Memory usage
-        stdin, stdout, stderr = ssh.exec_command("free -m")
-        mem_lines = stdout.read().decode().splitlines()
-        mem_info = mem_lines[1].split()
-        total_mb, used_mb, free_mb = map(int, mem_info[1:4])
-        ram_percent = round((used_mb / total_mb) * 100, 2)
+        # One round trip: two /proc/stat samples 0.2s apart for a CPU delta,
+        # plus /proc/meminfo. Much cheaper than forking top (which sleeps ~1s
+        # and emits a full screen buffer) and avoids locale-dependent parsing.
+        stdin, stdout, stderr = ssh.exec_command(
+            "head -1 /proc/stat; sleep 0.2; head -1 /proc/stat; echo ---; cat /proc/meminfo"
+        )
+        cpu_part, mem_part = stdout.read().decode().split("---", 1)
+        cpu_percent = _cpu_percent_from_proc_stat(cpu_part)
 
-        ssh.close()
+        meminfo = {}
+        for line in mem_part.splitlines():
+            if ':' in line:
+                key, value = line.split(':', 1)
+                meminfo[key.strip()] = int(value.strip().split()[0])  # kB
+        total_mb = meminfo.get("MemTotal", 0) // 1024
+        available_mb = meminfo.get("MemAvailable", 0) // 1024
+        used_mb = total_mb - available_mb
+        ram_percent = round((used_mb / total_mb) * 100, 2) if total_mb else 0.0
 
         return {
             "system_cpu_percent": cpu_percent,
             "system_ram_percent": ram_percent,
             "system_ram_total_gb": round(total_mb / 1024, 2),
             "system_ram_used_gb": round(used_mb / 1024, 2),
-            "system_ram_available_gb": round(free_mb / 1024, 2),
+            "system_ram_available_gb": round(available_mb / 1024, 2),
         }
 
     except Exception as e:
+        # Close and drop the cached client so the next poll reconnects
+        # from scratch. The failure may be in the command or the parsing
+        # with the transport still live, and a live transport owns a
+        # background thread and socket that would leak once per poll.
+        if _SSH_CLIENT is not None:
+            try:
+                _SSH_CLIENT.close()
+            except Exception:
+                pass
+        _SSH_CLIENT = None
         print(f"Warning: Could not get remote system metrics via SSH: {e}")
         return {
             "system_cpu_percent": 0.0,
@@ -98,30 +167,32 @@ def _get_remote_system_metrics():
             "system_ram_available_gb": 0.0
         }
 
+@ttl_cache(seconds=60)
 def get_postgres_server_metrics():
-    """Get PostgreSQL server-specific CPU and memory metrics"""
+    """Get PostgreSQL server-specific CPU and memory metrics.
+
+    Settings and db size change on the order of minutes, so repeated polls
+    within 60s reuse the cached result and skip the DB entirely.
+    """
     try:
         with get_connection() as conn, conn.cursor() as cur:
-            # Get PostgreSQL process memory usage
+            # One round trip for memory settings, db size, and activity counts;
+            # the CTE scans pg_stat_activity once for a consistent snapshot.
             cur.execute("""
+                WITH act AS (
+                    SELECT state FROM pg_stat_activity WHERE state IS NOT NULL
+                )
                 SELECT
                     pg_size_pretty(pg_database_size(current_database())) as db_size,
                     (SELECT setting::int FROM pg_settings WHERE name = 'shared_buffers') as shared_buffers_kb,
                     (SELECT setting::int FROM pg_settings WHERE name = 'work_mem') as work_mem_kb,
-                    (SELECT setting::int FROM pg_settings WHERE name = 'maintenance_work_mem') as maintenance_work_mem_kb
+                    (SELECT setting::int FROM pg_settings WHERE name = 'maintenance_work_mem') as maintenance_work_mem_kb,
+                    (SELECT count(*) FROM act) as active_connections,
+                    (SELECT sum(case when state = 'active' then 1 else 0 end) FROM act) as active_queries
             """)
             result = cur.fetchone()
-            
-            # Get active connections and their memory usage
-            cur.execute("""
-                SELECT
-                    count(*) as active_connections,
-                    sum(case when state = 'active' then 1 else 0 end) as active_queries
-                FROM pg_stat_activity
-                WHERE state IS NOT NULL
-            """)
-            conn_result = cur.fetchone()
-            
+            conn_result = (result[4], result[5]) if result else None
+
             return {
                 "postgres_db_size": result[0] if result else "N/A",
                 "postgres_shared_buffers_mb": round(result[1] / 1024, 2) if result and result[1] else 0,
@@ -1,105 +1,271 @@
-from utils.db_connection import get_connection
-
-def get_storage_usage():
-    """Get comprehensive storage usage including databases, tables, and indexes"""
-    storage_data = {}
-    
-    # Get per-database storage
-    storage_data['databases'] = get_database_storage()
-    
-    # Get per-table storage
-    storage_data['tables'] = get_table_storage()
-    
-    # Get per-index storage
-    storage_data['indexes'] = get_index_storage()
-    
-    # Get index usage statistics (scans, tuples read/fetched)
-    storage_data['index_usage'] = get_index_usage()
-    
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.caching import ttl_cache
+from utils.formatting import format_bytes
+from utils.db_connection import connection_scope, run_prepared
+
+# Rows are namedtuples: field access by name for new code, while existing
+# positional consumers (the PDF generator) keep working unchanged.
+DatabaseStorage = namedtuple('DatabaseStorage', 'datname size_pretty size_bytes')
+TableStorage = namedtuple(
+    'TableStorage',
+    'schemaname tablename total_size_pretty table_size_pretty index_size_pretty '
+    'total_size_bytes table_size_bytes row_count')
+IndexStorage = namedtuple('IndexStorage', 'schemaname indexname tablename size_pretty size_bytes')
+IndexUsage = namedtuple(
+    'IndexUsage',
+    'schemaname tablename indexname size_pretty size_bytes idx_scan idx_tup_read idx_tup_fetch')
+
+_COLLECTORS = (
+    ('databases', 'get_database_storage'),
+    ('tables', 'get_table_storage'),
+    ('indexes', 'get_index_storage'),
+    ('index_usage', 'get_index_usage'),
+)
+
+# Last (signature, storage_data) pair for the write-activity dirty check.
+_LAST_SNAPSHOT = None
+
+def _stats_signature(conn=None):
+    """Cheap write-activity fingerprint of the monitored database.
+
+    One round trip against the in-memory stats counters — no file stat()
+    calls — used to skip the expensive size queries when nothing changed.
+    """
+    query = """
+    SELECT
+        COALESCE(sum(n_tup_ins + n_tup_upd + n_tup_del), 0) AS writes,
+        count(*) AS tracked_tables
+    FROM pg_stat_all_tables;
+    """
+    return run_prepared('stor_signature', query, conn=conn)[0]
+
+@ttl_cache(seconds=30)
+def get_storage_usage(conn=None):
+    """Get comprehensive storage usage including databases, tables, and indexes.
+
+    Results are memoized for 30s: the pg_*_size functions stat every data
+    file, and storage figures don't move meaningfully between back-to-back
+    polls. Call get_storage_usage.cache_clear() to force a refresh.
+
+    The four catalog queries are independent; without a caller-provided
+    connection each runs on its own pooled connection in parallel so the
+    collection takes roughly the slowest query instead of the sum. With a
+    shared conn they run serially on that single connection.
+
+    Fusing the four into one statement (tagged jsonb_agg UNION) was
+    considered and dropped: psycopg2 cannot return multiple result sets
+    from one execute, the json round trip loses column types, and the
+    parallel path above already overlaps the round trips.
+    """
+    global _LAST_SNAPSHOT
+
+    # Dirty check: if the write counters haven't moved since the last full
+    # collection, the sizes can't have changed meaningfully either.
+    signature = _stats_signature(conn=conn)
+    if _LAST_SNAPSHOT is not None and _LAST_SNAPSHOT[0] == signature:
+        return _LAST_SNAPSHOT[1]
+
+    if conn is not None:
+        storage_data = {key: globals()[name](conn=conn) for key, name in _COLLECTORS}
+    else:
+        with ThreadPoolExecutor(max_workers=len(_COLLECTORS)) as executor:
+            futures = {key: executor.submit(globals()[name]) for key, name in _COLLECTORS}
+            storage_data = {key: future.result() for key, future in futures.items()}
+
+    _LAST_SNAPSHOT = (signature, storage_data)
     return storage_data
 
-def get_database_storage():
+def _clear_storage_caches(_ttl_clear=get_storage_usage.cache_clear):
+    """Drop the ttl_cache entry and the dirty-check snapshot together.
+
+    The snapshot must go too: VACUUM FULL, CLUSTER, and REINDEX change
+    relation sizes without moving the write counters, so on a quiet
+    system the signature check would keep serving the stale sizes that
+    cache_clear was called to discard.
+    """
+    global _LAST_SNAPSHOT
+    _LAST_SNAPSHOT = None
+    _ttl_clear()
+
+get_storage_usage.cache_clear = _clear_storage_caches
+
+def get_database_storage(conn=None):
     """Get storage usage per database"""
+    # pg_database_size stat()s every file of the database, so evaluate it
+    # once per row in a CTE instead of in the SELECT list and ORDER BY.
     query = """
-    SELECT 
-        datname, 
-        pg_size_pretty(pg_database_size(datname)) AS size_pretty,
-        pg_database_size(datname) AS size_bytes
-    FROM pg_database
-    WHERE datistemplate = false
-    ORDER BY pg_database_size(datname) DESC;
+    WITH d AS (
+        SELECT datname, pg_database_size(datname) AS size_bytes
+        FROM pg_database
+        WHERE datistemplate = false
+    )
+    SELECT
+        datname,
+        size_bytes
+    FROM d
+    ORDER BY size_bytes DESC;
     """
-    with get_connection() as conn, conn.cursor() as cur:
-        cur.execute(query)
-        return cur.fetchall()
+    # Pretty strings are built client-side; see note on _TABLE_STORAGE_SQL.
+    return run_prepared(
+        'stor_db', query, conn=conn,
+        row_factory=lambda raw: DatabaseStorage(raw[0], format_bytes(raw[1]), raw[1]))
 
-def get_table_storage():
+# Go straight to pg_class: pg_tables is itself a view over
+# pg_class+pg_namespace, so the old join would resolve every name twice, and
+# passing text to the size functions would force a per-row name->OID lookup.
+# The volatile size functions stat every segment file, so each is computed
+# exactly once per table in the CTE.
+_TABLE_STORAGE_SQL = """
+    WITH sized AS (
+        SELECT
+            n.nspname AS schemaname,
+            c.relname AS tablename,
+            COALESCE(NULLIF(s.n_live_tup, 0), NULLIF(c.reltuples::bigint, 0), 0) AS row_count,
+            pg_total_relation_size(c.oid) AS total_size_bytes,
+            pg_relation_size(c.oid) AS table_size_bytes
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_stat_all_tables s ON s.relid = c.oid
+        WHERE c.relkind IN ('r', 'p')
+          AND n.nspname NOT IN ('information_schema', 'pg_catalog')
+    )
+    SELECT
+        schemaname,
+        tablename,
+        total_size_bytes,
+        table_size_bytes,
+        row_count
+    FROM sized
+    ORDER BY total_size_bytes DESC"""
+
+# The pretty size strings are produced here rather than by pg_size_pretty:
+# that keeps per-row server function calls and wire bytes down, while the
+# returned tuples keep the historical column order.
+def _table_storage_row(raw):
+    schemaname, tablename, total_bytes, table_bytes, row_count = raw
+    return TableStorage(
+        schemaname,
+        tablename,
+        format_bytes(total_bytes),
+        format_bytes(table_bytes),
+        format_bytes(total_bytes - table_bytes),
+        total_bytes,
+        table_bytes,
+        row_count,
+    )
+
+def get_table_storage(conn=None):
     """Get storage usage per table"""
-    query = """
-    SELECT 
-        t.schemaname,
-        t.tablename,
-        pg_size_pretty(pg_total_relation_size(t.schemaname||'.'||t.tablename)) AS total_size_pretty,
-        pg_size_pretty(pg_relation_size(t.schemaname||'.'||t.tablename)) AS table_size_pretty,
-        pg_size_pretty(pg_total_relation_size(t.schemaname||'.'||t.tablename) - pg_relation_size(t.schemaname||'.'||t.tablename)) AS index_size_pretty,
-        pg_total_relation_size(t.schemaname||'.'||t.tablename) AS total_size_bytes,
-        pg_relation_size(t.schemaname||'.'||t.tablename) AS table_size_bytes,
-        COALESCE(NULLIF(s.n_live_tup, 0), NULLIF(c.reltuples::bigint, 0), 0) AS row_count
-    FROM pg_tables t
-    LEFT JOIN pg_stat_all_tables s
-      ON t.schemaname = s.schemaname AND t.tablename = s.relname
-    LEFT JOIN pg_namespace n
-      ON n.nspname = t.schemaname
-    LEFT JOIN pg_class c
-      ON c.relname = t.tablename AND c.relnamespace = n.oid AND c.relkind IN ('r','p','m','t')
-    WHERE t.schemaname NOT IN ('information_schema', 'pg_catalog')
-    ORDER BY pg_total_relation_size(t.schemaname||'.'||t.tablename) DESC
-    LIMIT 50;
+    return run_prepared(
+        'stor_tables', _TABLE_STORAGE_SQL + "\n    LIMIT 50;", conn=conn,
+        row_factory=_table_storage_row)
+
+def iter_table_storage(conn=None, itersize=1000):
+    """Stream the full, un-LIMITed table storage listing.
+
+    Uses a named server-side cursor so rows arrive in itersize batches
+    instead of one big fetchall; meant for callers that want the whole
+    catalog rather than the report's top 50.
     """
-    with get_connection() as conn, conn.cursor() as cur:
-        cur.execute(query)
-        return cur.fetchall()
+    with connection_scope(conn) as conn:
+        with conn.cursor(name='stor_tables_stream') as cur:
+            cur.itersize = itersize
+            cur.execute(_TABLE_STORAGE_SQL)
+            for raw in cur:
+                yield _table_storage_row(raw)
 
-def get_index_storage():
+def get_index_storage(conn=None):
     """Get storage usage per index"""
+    # Size by OID via pg_class instead of resolving schema||'.'||index text
+    # per call; the CTE evaluates pg_relation_size once per index.
     query = """
-    SELECT 
+    WITH ix AS (
+        SELECT
+            n.nspname AS schemaname,
+            c.relname AS indexname,
+            t.relname AS tablename,
+            pg_relation_size(c.oid) AS size_bytes
+        FROM pg_class c
+        JOIN pg_index i ON i.indexrelid = c.oid
+        JOIN pg_class t ON t.oid = i.indrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname NOT IN ('information_schema', 'pg_catalog')
+    )
+    SELECT
         schemaname,
         indexname,
         tablename,
-        pg_size_pretty(pg_relation_size(schemaname||'.'||indexname)) AS size_pretty,
-        pg_relation_size(schemaname||'.'||indexname) AS size_bytes
-    FROM pg_indexes 
-    WHERE schemaname NOT IN ('information_schema', 'pg_catalog')
-    ORDER BY pg_relation_size(schemaname||'.'||indexname) DESC
+        size_bytes
+    FROM ix
+    ORDER BY size_bytes DESC
     LIMIT 20;
     """
-    with get_connection() as conn, conn.cursor() as cur:
-        cur.execute(query)
-        return cur.fetchall()
+    return run_prepared(
+        'stor_indexes', query, conn=conn,
+        row_factory=lambda raw: IndexStorage(raw[0], raw[1], raw[2], format_bytes(raw[3]), raw[3]))
+
+# The size and scan count are materialized once per index in the CTE so the
+# ORDER BY sorts on plain columns instead of re-invoking the volatile
+# pg_relation_size for every candidate row before the LIMIT prunes.
+_INDEX_USAGE_SQL = """
+    WITH u AS (
+        SELECT
+            n.nspname                            AS schemaname,
+            c.relname                            AS tablename,
+            i.relname                            AS indexname,
+            pg_relation_size(i.oid)              AS size_bytes,
+            COALESCE(s.idx_scan, 0)              AS idx_scan,
+            COALESCE(s.idx_tup_read, 0)          AS idx_tup_read,
+            COALESCE(s.idx_tup_fetch, 0)         AS idx_tup_fetch
+        FROM pg_class c
+        JOIN pg_index ix        ON ix.indrelid = c.oid
+        JOIN pg_class i         ON i.oid = ix.indexrelid
+        JOIN pg_namespace n     ON n.oid = c.relnamespace
+        LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = i.oid
+        WHERE n.nspname NOT IN ('pg_catalog', 'information_schema')
+          AND c.relkind IN ('r','p')
+    )
+    SELECT
+        schemaname,
+        tablename,
+        indexname,
+        size_bytes,
+        idx_scan,
+        idx_tup_read,
+        idx_tup_fetch
+    FROM u
+    ORDER BY idx_scan DESC, size_bytes DESC"""
+
+def _index_usage_row(raw):
+    schemaname, tablename, indexname, size_bytes, scans, tup_read, tup_fetch = raw
+    return IndexUsage(
+        schemaname,
+        tablename,
+        indexname,
+        format_bytes(size_bytes),
+        size_bytes,
+        scans,
+        tup_read,
+        tup_fetch,
+    )
 
-def get_index_usage():
+def get_index_usage(conn=None):
     """Get index usage statistics (scans, tuples read/fetched) with sizes."""
-    query = """
-    SELECT 
-        n.nspname                            AS schemaname,
-        c.relname                            AS tablename,
-        i.relname                            AS indexname,
-        pg_size_pretty(pg_relation_size(i.oid)) AS size_pretty,
-        pg_relation_size(i.oid)              AS size_bytes,
-        COALESCE(s.idx_scan, 0)              AS idx_scan,
-        COALESCE(s.idx_tup_read, 0)          AS idx_tup_read,
-        COALESCE(s.idx_tup_fetch, 0)         AS idx_tup_fetch
-    FROM pg_class c
-    JOIN pg_index ix        ON ix.indrelid = c.oid
-    JOIN pg_class i         ON i.oid = ix.indexrelid
-    JOIN pg_namespace n     ON n.oid = c.relnamespace
-    LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = i.oid
-    WHERE n.nspname NOT IN ('pg_catalog', 'information_schema')
-      AND c.relkind IN ('r','p')
-    ORDER BY COALESCE(s.idx_scan, 0) DESC, pg_relation_size(i.oid) DESC
-    LIMIT 50;
+    return run_prepared(
+        'stor_index_usage', _INDEX_USAGE_SQL + "\n    LIMIT 50;", conn=conn,
+        row_factory=_index_usage_row)
+
+def iter_index_usage(conn=None, itersize=1000):
+    """Stream usage statistics for every user index.
+
+    Same named-cursor batching as iter_table_storage, for callers that
+    need the full index population instead of the report's top 50.
     """
-    with get_connection() as conn, conn.cursor() as cur:
-        cur.execute(query)
-        return cur.fetchall()
+    with connection_scope(conn) as conn:
+        with conn.cursor(name='stor_index_usage_stream') as cur:
+            cur.itersize = itersize
+            cur.execute(_INDEX_USAGE_SQL)
+            for raw in cur:
+                yield _index_usage_row(raw)
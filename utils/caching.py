@@ -0,0 +1,33 @@
+import time
+from functools import wraps
+from threading import Lock
+
+def ttl_cache(seconds):
+    """Memoize a zero/keyword-light function for a short time window.
+
+    Monitoring queries are read-mostly; when the tool is run on a short
+    schedule, re-fetching settings-like results every invocation just adds
+    DB round trips. Results are keyed on the call arguments and expire
+    after `seconds` (measured with time.monotonic).
+    """
+    def decorator(fn):
+        cache = {}
+        lock = Lock()
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with lock:
+                hit = cache.get(key)
+                if hit is not None and now - hit[0] < seconds:
+                    return hit[1]
+            value = fn(*args, **kwargs)
+            with lock:
+                cache[key] = (now, value)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
@@ -0,0 +1,24 @@
+def format_bytes(size_bytes):
+    """Format a byte count with a pg_size_pretty-like unit (bytes/kB/MB/GB/TB)."""
+    try:
+        size = float(size_bytes)
+    except (TypeError, ValueError):
+        return '0 bytes'
+    if size < 1024:
+        return f"{int(size)} bytes"
+    for unit in ('kB', 'MB', 'GB', 'TB'):
+        size /= 1024
+        if size < 1024 or unit == 'TB':
+            return f"{size:.1f} {unit}"
+
+def format_ms(ms):
+    """Format a millisecond duration as ms, s, or m like the old SQL CASE did."""
+    try:
+        value = float(ms)
+    except (TypeError, ValueError):
+        return '0ms'
+    if value >= 60000:
+        return f"{value / 60000:.2f}m"
+    if value >= 1000:
+        return f"{value / 1000:.2f}s"
+    return f"{value:.2f}ms"